@@ -1,17 +1,110 @@
 """
 Intelligent document chunking strategies.
 Preserves semantic meaning while respecting token limits.
+
+Importing this module loads the default tokenizer, which needs network
+access or a populated tiktoken cache (TIKTOKEN_CACHE_DIR).
 """
 
-from typing import List, Dict, Optional
+from collections import ChainMap
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, Iterator, List, Dict, Mapping, Optional, Tuple
+import numpy as np
 import tiktoken
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 import logging
+import re
 
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Matches the default LLM_MODEL in config (o200k_base tokenizer)
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model_name: str) -> tiktoken.Encoding:
+    """
+    Get cached tiktoken encoding for a model.
+    
+    Encoding lookup is expensive, so chunkers share one
+    Encoding instance per model name.
+    """
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        logger.warning(f"Model {model_name} not found, using cl100k_base")
+        return tiktoken.get_encoding("cl100k_base")
+
+
+# Load the default encoding at import so the first chunker is warm
+# (downloads the BPE file unless it's already cached)
+_get_encoding(DEFAULT_MODEL)
+
+
+@dataclass(eq=False, frozen=True)
+class ChunkBatch:
+    """
+    Chunks of one document, stored column-wise (read-only).
+    
+    Per-chunk counts live in NumPy arrays so stats are vectorized
+    reductions instead of Python loops over dicts. len(), indexing
+    and iteration work like the old list of chunk dicts, but each
+    chunk is a read-only mapping built on access: item assignment
+    raises TypeError, and list methods (append, +) aren't available.
+    Call to_dicts() for a mutable list of plain dicts (e.g. to attach
+    embeddings or serialize to JSON).
+    
+    Chunk metadata are ChainMap views over one shared document
+    metadata dict, exposed read-only as well. Fields can't be
+    reassigned and the count arrays aren't writeable; the texts and
+    metadatas lists are shared, so don't mutate them either.
+    """
+    texts: List[str]
+    token_counts: np.ndarray
+    char_counts: np.ndarray
+    metadatas: List[ChainMap]
+    
+    def __post_init__(self) -> None:
+        self.token_counts.flags.writeable = False
+        self.char_counts.flags.writeable = False
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def __getitem__(self, index: int | slice) -> Mapping[str, any] | List[Mapping[str, any]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self.texts))[index]]
+        
+        i = range(len(self.texts))[index]
+        chunk = self._chunk_dict(i)
+        chunk['metadata'] = MappingProxyType(chunk['metadata'])
+        return MappingProxyType(chunk)
+    
+    def __iter__(self) -> Iterator[Mapping[str, any]]:
+        for i in range(len(self.texts)):
+            yield self[i]
+    
+    def to_dicts(self) -> List[Dict[str, any]]:
+        """Materialize chunks as plain, mutable dicts with plain metadata dicts."""
+        chunks = []
+        for i in range(len(self.texts)):
+            chunk = self._chunk_dict(i)
+            chunk['metadata'] = dict(chunk['metadata'])
+            chunks.append(chunk)
+        return chunks
+    
+    def _chunk_dict(self, i: int) -> Dict[str, any]:
+        return {
+            'text': self.texts[i],
+            'chunk_id': i,
+            'token_count': int(self.token_counts[i]),
+            'char_count': int(self.char_counts[i]),
+            'metadata': self.metadatas[i]
+        }
+
 
 class SmartChunker:
     """
@@ -28,7 +121,7 @@ class SmartChunker:
         self, 
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
-        model_name: str = "gpt-4"
+        model_name: str = DEFAULT_MODEL
     ):
         """
         Initialize chunker with token-aware settings.
@@ -36,39 +129,41 @@ class SmartChunker:
         Args:
             chunk_size: Target tokens per chunk
             chunk_overlap: Tokens to overlap between chunks
-            model_name: Model for tokenizer (gpt-4, gpt-3.5-turbo, etc)
+            model_name: Model for tokenizer (gpt-4o-mini, gpt-4, etc)
+        
+        Raises:
+            ValueError: If chunk_overlap is not smaller than chunk_size
         """
+        if chunk_overlap >= chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({chunk_overlap}) must be smaller than "
+                f"chunk_size ({chunk_size})"
+            )
+        
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         
         # Initialize tokenizer for accurate token counting
         # Critical: different models have different tokenizers
-        try:
-            self.encoding = tiktoken.encoding_for_model(model_name)
-        except KeyError:
-            logger.warning(f"Model {model_name} not found, using cl100k_base")
-            self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.encoding = _get_encoding(model_name)
         
-        # LangChain splitter with smart separators
+        # Smart separators
         # Order matters: tries to split on larger semantic units first
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=self.count_tokens,
-            separators=[
-                "\n\n\n",    # Major section breaks
-                "\n\n",      # Paragraph breaks
-                "\n",        # Line breaks
-                ". ",        # Sentence endings
-                "! ",        # Exclamations
-                "? ",        # Questions
-                "; ",        # Semicolons
-                ", ",        # Commas
-                " ",         # Words
-                ""           # Characters (last resort)
-            ],
-            keep_separator=True
-        )
+        self.separators = [
+            "\n\n\n",    # Major section breaks
+            "\n\n",      # Paragraph breaks
+            "\n",        # Line breaks
+            ". ",        # Sentence endings
+            "! ",        # Exclamations
+            "? ",        # Questions
+            "; ",        # Semicolons
+            ", ",        # Commas
+            " ",         # Words
+            ""           # Characters (last resort)
+        ]
+        
+        # Window walk specialized for this configuration
+        self._split_tokens = self._build_token_splitter()
     
     def count_tokens(self, text: str) -> int:
         """
@@ -87,11 +182,23 @@ class SmartChunker:
         """
         return len(self.encoding.encode(text))
     
+    def count_tokens_upper(self, text: str) -> int:
+        """
+        Cheap upper bound on count_tokens, for threshold checks only.
+        
+        Every BPE token covers at least one UTF-8 byte, so the byte
+        length never under-counts; for ASCII that's just len(text).
+        Use count_tokens when the exact number matters.
+        """
+        if text.isascii():
+            return len(text)
+        return len(text.encode('utf-8'))
+    
     def chunk_document(
         self, 
         text: str, 
         metadata: Optional[Dict] = None
-    ) -> List[Dict[str, any]]:
+    ) -> ChunkBatch:
         """
         Split document into overlapping chunks.
         
@@ -100,43 +207,228 @@ class SmartChunker:
             metadata: Original document metadata
             
         Returns:
-            List of chunk dicts with text, metadata, stats
+            Read-only ChunkBatch of texts, token/char counts and
+            metadata (previously a list of dicts). Indexing yields
+            read-only chunk mappings; use .to_dicts() for a mutable list.
+            Chunk metadata are ChainMaps (not JSON-serializable as-is);
+            .to_dicts() also converts them to plain dicts.
         """
         if not text or not text.strip():
             logger.warning("Empty text provided to chunker")
-            return []
-        
-        # Split text using LangChain
-        chunks = self.splitter.split_text(text)
-        
-        # Add metadata to each chunk
-        chunk_objects = []
-        for i, chunk_text in enumerate(chunks):
-            chunk_obj = {
-                'text': chunk_text,
-                'chunk_id': i,
-                'token_count': self.count_tokens(chunk_text),
-                'char_count': len(chunk_text),
-                'metadata': {
-                    **(metadata or {}),
-                    'chunk_index': i,
-                    'total_chunks': len(chunks),
-                }
-            }
-            chunk_objects.append(chunk_obj)
+            return ChunkBatch(
+                texts=[],
+                token_counts=np.zeros(0, dtype=np.int32),
+                char_counts=np.zeros(0, dtype=np.int32),
+                metadatas=[]
+            )
+        
+        chunks = []
+        token_counts = []
         
-        logger.info(
-            f"✓ Created {len(chunk_objects)} chunks "
-            f"(avg {sum(c['token_count'] for c in chunk_objects) / len(chunk_objects):.0f} tokens/chunk)"
+        if self.count_tokens_upper(text) <= self.chunk_size:
+            # Whole document fits in one chunk: skip boundary search
+            chunk = text.strip()
+            chunks.append(chunk)
+            token_counts.append(self.count_tokens(chunk))
+        else:
+            # Encode once and split on token boundaries
+            ids = self.encoding.encode(text)
+            for chunk, token_count in self._split_tokens(text, ids):
+                chunks.append(chunk)
+                token_counts.append(token_count)
+        
+        n = len(chunks)
+        # One copy per document, so later caller edits don't leak into chunks
+        shared = dict(metadata or {})
+        batch = ChunkBatch(
+            texts=chunks,
+            token_counts=np.fromiter(token_counts, dtype=np.int32, count=n),
+            char_counts=np.fromiter(
+                (len(c) for c in chunks), dtype=np.int32, count=n
+            ),
+            # Per-chunk fields layered over one shared metadata dict,
+            # instead of copying the document metadata into every chunk
+            metadatas=[
+                ChainMap({'chunk_index': i, 'total_chunks': n}, shared)
+                for i in range(n)
+            ]
         )
         
-        return chunk_objects
+        # Averages etc. are left to get_chunk_stats
+        logger.info("✓ Created %d chunks", n)
+        
+        return batch
+    
+    def _build_token_splitter(
+        self
+    ) -> Callable[[str, List[int]], List[Tuple[str, int]]]:
+        """
+        Build the token-window splitter for this chunker's configuration.
+        
+        Chunk sizes, the compiled separator regex and tokenizer methods
+        are bound once as closure locals. Per document, token bytes are
+        decoded once and char offsets / character-start flags derived
+        from them with NumPy, so the window walk only does list lookups.
+        """
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        
+        # One alternation over the non-empty separators, in priority order;
+        # the matching group index is the separator's priority level
+        split_separators = [sep for sep in self.separators if sep]
+        find_separators = re.compile(
+            "|".join(f"({re.escape(sep)})" for sep in split_separators)
+        ).finditer
+        no_sep = len(split_separators)
+        longest_sep = max(map(len, split_separators))
+        
+        encode = self.encoding.encode
+        decode_tokens_bytes = self.encoding.decode_tokens_bytes
+        
+        def token_offsets(pieces: List[bytes]) -> Tuple[List[int], List[bool]]:
+            """
+            Char offset of each token and whether it starts a character.
+            
+            Vectorized over the document's UTF-8 bytes instead of
+            tiktoken's per-token decode_with_offsets loop; offsets match
+            it (a token starting mid-character gets that character's
+            offset). Both lists carry a trailing end-of-text entry.
+            """
+            data = np.frombuffer(b"".join(pieces), dtype=np.uint8)
+            byte_starts = np.zeros(len(pieces) + 1, dtype=np.int64)
+            np.cumsum(
+                np.fromiter(map(len, pieces), dtype=np.int64, count=len(pieces)),
+                out=byte_starts[1:]
+            )
+            # UTF-8 continuation bytes are 0b10xxxxxx
+            lead = np.append((data & 0xC0) != 0x80, True)
+            chars_before = np.zeros(len(data) + 1, dtype=np.int64)
+            np.cumsum(lead[:-1], out=chars_before[1:])
+            char_start = lead[byte_starts]
+            offsets = chars_before[byte_starts] - ~char_start
+            return offsets.tolist(), char_start.tolist()
+        
+        def find_split(
+            text: str,
+            offsets: List[int],
+            char_start: List[bool],
+            token_at: Dict[int, int],
+            start: int,
+            end: int
+        ) -> int:
+            """
+            Find where to end the window ids[start:end].
+            
+            Scans only the back half of the window for separators and
+            picks the last token boundary touching the highest-priority
+            one (edges or inside, since BPE often splits ". " as
+            "." + " word"), falling back to the last boundary that
+            doesn't split a character.
+            """
+            lowest = start + max(1, (end - start) // 2)
+            best, best_level = end, no_sep
+            # Reach past the window end so a separator starting right at it counts
+            for match in find_separators(text, offsets[lowest], offsets[end] + longest_sep):
+                level = match.lastindex - 1
+                if level > best_level:
+                    continue
+                for pos in range(match.start(), match.end() + 1):
+                    i = token_at.get(pos)
+                    if (
+                        i is not None
+                        and lowest <= i <= end
+                        and (level < best_level or i > best)
+                    ):
+                        best, best_level = i, level
+            if best_level < no_sep:
+                return best
+            
+            # Characters (last resort)
+            for i in range(end, start, -1):
+                if char_start[i]:
+                    return i
+            return end
+        
+        def overlap_start(
+            text: str,
+            offsets: List[int],
+            char_start: List[bool],
+            start: int,
+            end: int
+        ) -> int:
+            """Start of the next window: back up chunk_overlap tokens, snapped to a word."""
+            first = max(start + 1, end - chunk_overlap)
+            for i in range(first, end):
+                pos = offsets[i]
+                if char_start[i] and (text[pos - 1:pos].isspace() or text[pos:pos + 1].isspace()):
+                    return i
+            for i in range(first, end):
+                if char_start[i]:
+                    return i
+            return end
+        
+        def window_text(
+            text: str,
+            pieces: List[bytes],
+            offsets: List[int],
+            start: int,
+            end: int
+        ) -> Tuple[str, int]:
+            """Text of tokens start:end without edge whitespace, and its token count."""
+            while start < end and pieces[start].isspace():
+                start += 1
+            while end > start and pieces[end - 1].isspace():
+                end -= 1
+            chunk = text[offsets[start]:offsets[end]].strip()
+            # Stripping re-tokenizes the edges (" augmented" is one token,
+            # "augmented" two), so count the text actually returned
+            return chunk, len(encode(chunk))
+        
+        def split_tokens(text: str, ids: List[int]) -> List[Tuple[str, int]]:
+            """
+            Split a pre-tokenized document into overlapping token windows.
+            
+            Returns:
+                (chunk text, token count) per non-empty window
+            """
+            pieces = decode_tokens_bytes(ids)
+            offsets, char_start = token_offsets(pieces)
+            # Char position -> token starting a character there
+            token_at = {
+                offsets[i]: i for i in np.flatnonzero(char_start).tolist()
+            }
+            n = len(ids)
+            
+            chunks = []
+            start = 0
+            while start < n:
+                end = min(start + chunk_size, n)
+                if end < n:
+                    end = find_split(text, offsets, char_start, token_at, start, end)
+                chunk, token_count = window_text(text, pieces, offsets, start, end)
+                # A re-tokenized edge can push a full window past chunk_size;
+                # back off to the previous split point until it fits
+                while token_count > chunk_size and end - start > 1:
+                    end = find_split(text, offsets, char_start, token_at, start, end - 1)
+                    chunk, token_count = window_text(text, pieces, offsets, start, end)
+                if chunk:
+                    chunks.append((chunk, token_count))
+                if end >= n:
+                    break
+                start = (
+                    overlap_start(text, offsets, char_start, start, end)
+                    if chunk_overlap else end
+                )
+            
+            return chunks
+        
+        return split_tokens
     
     def chunk_with_headers(
         self,
         text: str,
         metadata: Optional[Dict] = None
-    ) -> List[Dict[str, any]]:
+    ) -> ChunkBatch:
         """
         Advanced: Preserve document structure by detecting headers.
         
@@ -147,36 +439,63 @@ class SmartChunker:
         # For now, use standard chunking
         return self.chunk_document(text, metadata)
     
-    def get_chunk_stats(self, chunks: List[Dict]) -> Dict:
+    def get_chunk_stats(self, chunks: ChunkBatch | List[Dict]) -> Dict:
         """
         Get statistics about chunks.
         
         Useful for debugging and optimization.
         """
-        if not chunks:
+        if not len(chunks):
             return {}
         
-        token_counts = [c['token_count'] for c in chunks]
+        if isinstance(chunks, ChunkBatch):
+            token_counts = chunks.token_counts
+            char_counts = chunks.char_counts
+        else:
+            token_counts = np.fromiter(
+                (c['token_count'] for c in chunks), dtype=np.int32, count=len(chunks)
+            )
+            char_counts = np.fromiter(
+                (c['char_count'] for c in chunks), dtype=np.int32, count=len(chunks)
+            )
         
         return {
             'total_chunks': len(chunks),
-            'total_tokens': sum(token_counts),
-            'avg_tokens': sum(token_counts) / len(token_counts),
-            'min_tokens': min(token_counts),
-            'max_tokens': max(token_counts),
-            'total_chars': sum(c['char_count'] for c in chunks)
+            'total_tokens': int(token_counts.sum()),
+            'avg_tokens': float(token_counts.mean()),
+            'min_tokens': int(token_counts.min()),
+            'max_tokens': int(token_counts.max()),
+            'total_chars': int(char_counts.sum())
         }
 
 
+@lru_cache(maxsize=16)
+def _get_chunker(
+    chunk_size: int,
+    chunk_overlap: int,
+    model_name: str = DEFAULT_MODEL
+) -> SmartChunker:
+    """
+    Get cached chunker for a configuration.
+    
+    SmartChunker holds no per-document state after construction,
+    and tiktoken Encodings are thread-safe, so one instance can be
+    shared across calls and threads.
+    """
+    return SmartChunker(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        model_name=model_name
+    )
+
+
 def chunk_text(
     text: str,
     chunk_size: int = 1000,
     chunk_overlap: int = 200,
-    metadata: Optional[Dict] = None
-) -> List[Dict]:
+    metadata: Optional[Dict] = None,
+    model_name: str = DEFAULT_MODEL
+) -> ChunkBatch:
     """Convenience function for quick chunking"""
-    chunker = SmartChunker(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap
-    )
+    chunker = _get_chunker(chunk_size, chunk_overlap, model_name)
     return chunker.chunk_document(text, metadata)
@@ -7,6 +7,18 @@ import logging
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Dict
+
+
+# Format: timestamp - name - level - message
+# Shared by every handler; formatters are stateless
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Fully configured loggers by name, for get_logger
+_LOGGER_CACHE: Dict[str, logging.Logger] = {}
 
 
 def setup_logger(
@@ -35,13 +47,7 @@ def setup_logger(
     # Console handler with formatting
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
-    
-    # Format: timestamp - name - level - message
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(_FORMATTER)
     logger.addHandler(console_handler)
     
     # Optional file handler
@@ -49,12 +55,18 @@ def setup_logger(
         log_file.parent.mkdir(parents=True, exist_ok=True)
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(_FORMATTER)
         logger.addHandler(file_handler)
     
     return logger
 
 
 def get_logger(name: str) -> logging.Logger:
-    """Quick access to logger"""
-    return setup_logger(name)
+    """Quick access to logger (configured once per name, then cached)"""
+    logger = _LOGGER_CACHE.get(name)
+    if logger is not None:
+        return logger
+    
+    logger = setup_logger(name)
+    _LOGGER_CACHE[name] = logger
+    return logger
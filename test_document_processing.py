@@ -3,6 +3,7 @@ Quick test script for document processing.
 Run: python test_document_processing.py
 """
 
+import tempfile
 from pathlib import Path
 from src.document_processing.loaders import DocumentLoader
 from src.document_processing.chunkers import SmartChunker
@@ -86,6 +87,44 @@ stats = chunker.get_chunk_stats(chunks)
 for key, value in stats.items():
     print(f"   {key}: {value}")
 
+# Test 5: Non-UTF-8 text files decode losslessly
+print("\n5. Encoding fallbacks...")
+encoding_cases = [
+    # (file name, text, encoding used to write it, encoding the loader should report)
+    ("utf8.txt", "Ça coûte très cher… Voilà", "utf-8", "utf-8"),
+    # "…" is 0x85 in cp1252 but a C1 control in latin-1
+    ("cp1252_french.txt", "Ça coûte très cher… Voilà", "cp1252", "cp1252"),
+    # First non-UTF-8 byte sits past the first 64KB
+    ("cp1252_late.txt", "a" * 70000 + "café", "cp1252", "cp1252"),
+    # 0x81 is undefined in cp1252, so only latin-1 decodes this
+    ("latin1.txt", "caf\xe9 \x81", "latin-1", "latin-1"),
+]
+with tempfile.TemporaryDirectory() as tmp_dir:
+    for name, content, written_as, expected in encoding_cases:
+        path = Path(tmp_dir) / name
+        path.write_bytes(content.encode(written_as))
+        loaded = DocumentLoader.load(path)
+        assert loaded['text'] == content.strip(), f"{name} decoded incorrectly"
+        assert loaded['metadata']['encoding'] == expected, (
+            f"{name}: expected {expected}, got {loaded['metadata']['encoding']}"
+        )
+        print(f"   ✓ {name}: {loaded['metadata']['encoding']}")
+
+# Test 6: Multi-chunk documents stay within chunk_size with exact counts
+print("\n6. Multi-chunk windows...")
+small_chunker = SmartChunker(chunk_size=64, chunk_overlap=16)
+small_chunks = small_chunker.chunk_document(doc['text'], doc['metadata'])
+assert len(small_chunks) > 1, "sample should need several 64-token chunks"
+for chunk in small_chunks:
+    assert chunk['text'] == chunk['text'].strip(), f"chunk {chunk['chunk_id']} not stripped"
+    assert chunk['token_count'] == small_chunker.count_tokens(chunk['text']), (
+        f"chunk {chunk['chunk_id']}: token_count {chunk['token_count']} is wrong"
+    )
+    assert chunk['token_count'] <= 64, (
+        f"chunk {chunk['chunk_id']} has {chunk['token_count']} tokens"
+    )
+print(f"   ✓ {len(small_chunks)} chunks, max {max(small_chunks.token_counts)} tokens")
+
 print("\n" + "=" * 60)
 print("✓ ALL TESTS PASSED")
 print("=" * 60)